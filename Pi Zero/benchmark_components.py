@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+WRB Component Microbenchmarks
+Times the hot paths of PiScript and monitor_system.py against generated
+sound libraries and logs, and saves the results as JSON for comparison.
+
+Runs on a plain Linux box: audio uses SDL's dummy driver and every WAV,
+media tree and log file is generated in a temporary directory.
+
+Usage:
+    python3 benchmark_components.py
+    python3 benchmark_components.py --quick
+    python3 benchmark_components.py --compare bench_results_old.json
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import wave
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+import importlib.util
+import importlib.machinery
+from array import array
+from datetime import datetime, timedelta
+
+# Must be set before pygame is imported anywhere
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+SOUND_PREFIXES = ["button1", "button2", "hold1", "hold2"]
+
+def load_piscript():
+    """Import PiScript (which has no .py extension) as a module"""
+    path = os.path.join(SCRIPT_DIR, "PiScript")
+    loader = importlib.machinery.SourceFileLoader("piscript", path)
+    spec = importlib.util.spec_from_loader("piscript", loader)
+    module = importlib.util.module_from_spec(spec)
+    with quiet():
+        loader.exec_module(module)
+    return module
+
+@contextlib.contextmanager
+def quiet():
+    """Discard the [WRB] progress prints while timing"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def measure(fn, repeat=5, number=1):
+    """Time fn() and return per-call statistics in seconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.mean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'repeat': repeat,
+        'number': number,
+    }
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def write_wav(path, seconds, rate=44100, channels=2):
+    """Write a 16-bit sine-wave WAV file"""
+    period = array('h', (int(12000 * math.sin(2 * math.pi * 440 * i / rate))
+                         for i in range(rate // 10) for _ in range(channels)))
+    frames = int(seconds * rate)
+    chunk = period.tobytes()
+    frame_bytes = 2 * channels
+    with wave.open(path, 'wb') as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        remaining = frames * frame_bytes
+        while remaining > 0:
+            w.writeframes(chunk[:remaining])
+            remaining -= len(chunk)
+    return path
+
+def make_sound_library(directory, wav_count, noise_count=0, template=None):
+    """Fill directory with wav_count sound files spread across all prefixes"""
+    os.makedirs(directory, exist_ok=True)
+    if template is None:
+        template = write_wav(os.path.join(directory, "_template.wav"), 0.05)
+    with open(template, 'rb') as f:
+        data = f.read()
+    for i in range(wav_count):
+        prefix = SOUND_PREFIXES[i % len(SOUND_PREFIXES)]
+        with open(os.path.join(directory, f"{prefix}_{i:05d}.wav"), 'wb') as f:
+            f.write(data)
+    for i in range(noise_count):
+        name = random.choice(["track_%05d.mp3", "IMG_%05d.JPG", "notes_%05d.txt", "clip_%05d.wav"]) % i
+        open(os.path.join(directory, name), 'w').close()
+    return directory
+
+def make_receiver_lines(count, rng):
+    """Generate a realistic mix of Receiver ESP32 serial output"""
+    def mac():
+        return ":".join("%02X" % rng.randrange(256) for _ in range(6))
+    templates = [
+        (30, lambda: "BTN%d\n" % rng.choice((1, 2))),
+        (10, lambda: "BTN%d HOLD\n" % rng.choice((1, 2))),
+        (30, lambda: "RX: BTN%d from %s\n" % (rng.choice((1, 2)), mac())),
+        (10, lambda: "RX: BTN%d HOLD from %s\n" % (rng.choice((1, 2)), mac())),
+        (10, lambda: "Status: %d transmitters, %d linked\n" % (rng.randrange(1, 4), rng.randrange(0, 4))),
+        (5, lambda: "Authorized transmitter connected: %s\n" % mac()),
+        (3, lambda: "Rejected message from unauthorized MAC: %s\n" % mac()),
+        (2, lambda: "\n"),
+    ]
+    weights = [w for w, _ in templates]
+    makers = [m for _, m in templates]
+    return [rng.choices(makers, weights)[0]() for _ in range(count)]
+
+def make_logs(directory, size_mb):
+    """Write a button log and a health log of roughly size_mb each"""
+    button_log = os.path.join(directory, "button_log.txt")
+    health_log = os.path.join(directory, "health_log.txt")
+    target = size_mb * 1024 * 1024
+    old = (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d %H:%M:%S')
+    recent = (datetime.now() - timedelta(minutes=5)).strftime('%Y-%m-%d %H:%M:%S')
+
+    button_lines = [
+        f"{old} [INFO] RIGHT button pressed (src=USB:/media/usb0)\n",
+        f"{old} [INFO] WRONG button pressed (src=USB:/media/usb0)\n",
+        f"{old} [INFO] Serial line received: BTN1\n",
+        f"{old} [INFO] Audio source unchanged\n",
+    ]
+    stats = {'uptime': '2 days, 3:04:05', 'button_presses': 12345, 'errors': 3,
+             'error_rate': '0.02%', 'led_available': True, 'serial_connected': True}
+    health_lines = [
+        f"{old} [HEALTH] " + json.dumps(stats) + "\n",
+        f"{old} [INFO] Serial link OK\n",
+        f"{old} [INFO] Mixer channels busy: 2/16\n",
+        f"{old} [ERROR] Serial read error: device reports readiness to read but returned no data\n",
+    ]
+
+    for path, lines, tail in ((button_log, button_lines, f"{recent} [INFO] RIGHT button pressed (src=LOCAL)\n"),
+                              (health_log, health_lines, f"{recent} [HEALTH] " + json.dumps(stats) + "\n")):
+        block = "".join(lines * 2048)
+        with open(path, 'w') as f:
+            written = 0
+            while written < target:
+                f.write(block)
+                written += len(block)
+            f.write(tail * 100)
+    return button_log, health_log
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def bench_classify(ps, args):
+    rng = random.Random(1234)
+    lines = make_receiver_lines(args.lines, rng)
+    classify = ps.classify
+
+    def run():
+        for line in lines:
+            classify(line)
+
+    result = measure(run, repeat=args.repeat)
+    result['lines'] = len(lines)
+    result['per_line_ns'] = result['median'] / len(lines) * 1e9
+    return {'classify': result}
+
+def bench_usb_mount_dirs(ps, args, tmp):
+    results = {}
+    for entries in (4, args.wav_count // 10, args.wav_count):
+        media = os.path.join(tmp, f"media_{entries}")
+        for i in range(entries):
+            os.makedirs(os.path.join(media, f"usb{i}"), exist_ok=True)
+        with quiet():
+            result = measure(lambda: ps.usb_mount_dirs(media), repeat=args.repeat)
+        result['entries'] = entries
+        results[f"usb_mount_dirs[{entries}]"] = result
+    return results
+
+def bench_pick_source(ps, args, tmp):
+    results = {}
+    template = write_wav(os.path.join(tmp, "_pick_template.wav"), 0.05)
+    original_mounts = ps.usb_mount_dirs
+    original_home = os.environ.get("HOME")
+    try:
+        for wav_count in (args.wav_count // 10, args.wav_count):
+            # Two drives with no WRB sounds ahead of the one that has them
+            mounts = [
+                make_sound_library(os.path.join(tmp, f"pick_{wav_count}", "usb0"), 0, noise_count=wav_count, template=template),
+                make_sound_library(os.path.join(tmp, f"pick_{wav_count}", "usb1"), 0, noise_count=wav_count, template=template),
+                make_sound_library(os.path.join(tmp, f"pick_{wav_count}", "usb2"), wav_count, noise_count=wav_count // 4, template=template),
+            ]
+            ps.usb_mount_dirs = lambda: mounts
+            with quiet():
+                result = measure(ps.pick_source, repeat=args.repeat)
+            result['wav_count'] = wav_count
+            results[f"pick_source[usb,{wav_count}]"] = result
+
+            home = os.path.join(tmp, f"home_{wav_count}")
+            make_sound_library(os.path.join(home, "WRB", "sounds"), wav_count, template=template)
+            os.environ["HOME"] = home
+            ps.usb_mount_dirs = lambda: []
+            with quiet():
+                result = measure(ps.pick_source, repeat=args.repeat)
+            result['wav_count'] = wav_count
+            results[f"pick_source[local,{wav_count}]"] = result
+    finally:
+        ps.usb_mount_dirs = original_mounts
+        if original_home is not None:
+            os.environ["HOME"] = original_home
+    return results
+
+def bench_load_sounds(ps, args, tmp):
+    import pygame
+    results = {}
+    directory = os.path.join(tmp, "load")
+    os.makedirs(directory, exist_ok=True)
+    for rate in (22050, 44100, 48000):
+        for seconds in args.durations:
+            path = write_wav(os.path.join(directory, f"button1_{rate}_{seconds}s.wav"), seconds, rate)
+            result = measure(lambda: ps.load_sounds([path], [], [], []), repeat=args.repeat)
+            result['sample_rate'] = rate
+            result['seconds'] = seconds
+            result['bytes'] = os.path.getsize(path)
+            result['mb_per_s'] = result['bytes'] / result['median'] / 1e6
+            results[f"load_sounds[{rate}Hz,{seconds}s]"] = result
+
+    # A full button2/hold2 library as loaded on a source change
+    paths = [write_wav(os.path.join(directory, f"button2_{i:03d}.wav"), 2.0, 44100) for i in range(args.library_size)]
+    result = measure(lambda: ps.load_sounds([], paths, [], []), repeat=max(1, args.repeat // 2))
+    result['files'] = len(paths)
+    results[f"load_sounds[library,{len(paths)}x2s]"] = result
+
+    # Same library with normalization on and every file already cached: the
+    # per-file stat/realpath/lookup plus the cache save at the end of the pass
+    original_cache = ps.LOUDNESS_CACHE
+    try:
+        ps.LOUDNESS_CACHE = os.path.join(directory, "loudness_cache.json")
+        for path in paths:
+            rms_dbfs, peak_dbfs = ps.analyze_loudness(pygame.mixer.Sound(path))
+            now = time.time()
+            ps._loudness_cache[ps.loudness_key(path)] = {'path': path, 'rms_dbfs': rms_dbfs, 'peak_dbfs': peak_dbfs,
+                                                         'analyzed': now, 'last_used': now}
+        ps._loudness_enabled = True
+        result = measure(lambda: ps.load_sounds([], paths, [], []), repeat=max(1, args.repeat // 2))
+        result['files'] = len(paths)
+        results[f"load_sounds[library,{len(paths)}x2s,normalized]"] = result
+    finally:
+        ps._loudness_enabled = False
+        ps._loudness_cache.clear()
+        ps.LOUDNESS_CACHE = original_cache
+    return results
+
+def bench_fade(ps, args, tmp):
+    import pygame
+    results = {}
+    sound = pygame.mixer.Sound(write_wav(os.path.join(tmp, "fade.wav"), 1.0))
+    duration = args.fade_duration
+    for busy in (1, 4, 8, 15):
+        spawn, overrun = [], []
+        for _ in range(args.repeat):
+            channels = [pygame.mixer.Channel(ch) for ch in range(busy)]
+            for channel in channels:
+                channel.play(sound, loops=-1)
+            start = time.perf_counter()
+            with quiet():
+                threads = [ps.fade_out_sound(channel, duration) for channel in channels if channel.get_busy()]
+                spawned = time.perf_counter()
+                for thread in threads:
+                    thread.join()
+            done = time.perf_counter()
+            spawn.append(spawned - start)
+            overrun.append(done - start - duration)
+            for channel in channels:
+                channel.stop()
+        results[f"fade_out_sound[{busy}ch]"] = {
+            'min': min(overrun),
+            'median': statistics.median(overrun),
+            'mean': statistics.mean(overrun),
+            'stdev': statistics.stdev(overrun) if len(overrun) > 1 else 0.0,
+            'repeat': args.repeat,
+            'number': 1,
+            'busy_channels': busy,
+            'fade_duration': duration,
+            'spawn_median': statistics.median(spawn),
+            'note': 'timings are wall-clock overrun past fade_duration',
+        }
+    return results
+
+def bench_loudness(ps, args, tmp):
+    import pygame
+    results = {}
+    directory = os.path.join(tmp, "loudness")
+    os.makedirs(directory, exist_ok=True)
+    for seconds in args.durations:
+        path = write_wav(os.path.join(directory, f"button2_{seconds}s.wav"), seconds)
+        sound = pygame.mixer.Sound(path)
+        result = measure(lambda: ps.analyze_loudness(sound), repeat=args.repeat)
+        result['seconds'] = seconds
+        result['realtime_factor'] = seconds / result['median']
+        results[f"analyze_loudness[{seconds}s]"] = result
+    return results
+
+def bench_check_sound_files(mon, args, tmp):
+    results = {}
+    template = write_wav(os.path.join(tmp, "_check_template.wav"), 0.05)
+    original = (mon.SOUNDS_DIR, mon.MEDIA_DIR)
+    try:
+        for wav_count in (args.wav_count // 10, args.wav_count):
+            sounds = make_sound_library(os.path.join(tmp, f"check_{wav_count}", "sounds"), wav_count,
+                                        noise_count=wav_count // 4, template=template)
+            media = os.path.join(tmp, f"check_{wav_count}", "media")
+            for i in range(8):
+                os.makedirs(os.path.join(media, f"usb{i}"), exist_ok=True)
+            mon.SOUNDS_DIR, mon.MEDIA_DIR = sounds, media
+            result = measure(mon.check_sound_files, repeat=args.repeat)
+            result['wav_count'] = wav_count
+            results[f"check_sound_files[{wav_count}]"] = result
+    finally:
+        mon.SOUNDS_DIR, mon.MEDIA_DIR = original
+    return results
+
+def bench_log_parsing(mon, args, tmp):
+    results = {}
+    button_log, health_log = make_logs(tmp, args.log_mb)
+    original = (mon.LOG_FILE, mon.HEALTH_LOG)
+    repeat = min(args.repeat, 3)
+    try:
+        mon.LOG_FILE, mon.HEALTH_LOG = button_log, health_log
+        for name, fn, path in (("parse_health_log", mon.parse_health_log, health_log),
+                               ("get_recent_button_presses", mon.get_recent_button_presses, button_log)):
+            result = measure(fn, repeat=repeat)
+            result['log_mb'] = os.path.getsize(path) / (1024 * 1024)
+            result['mb_per_s'] = result['log_mb'] / result['median']
+            results[f"{name}[{args.log_mb}MB]"] = result
+    finally:
+        mon.LOG_FILE, mon.HEALTH_LOG = original
+    return results
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def format_seconds(value):
+    if abs(value) < 1e-3:
+        return f"{value * 1e6:9.1f} us"
+    if abs(value) < 1.0:
+        return f"{value * 1e3:9.2f} ms"
+    return f"{value:9.3f} s "
+
+def print_results(results):
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        print(f"  {name:<{width}}  median {format_seconds(result['median'])}  min {format_seconds(result['min'])}")
+
+def compare_results(results, previous_path):
+    """Print the median ratio of this run against a previous JSON run"""
+    with open(previous_path, 'r') as f:
+        previous = json.load(f).get('results', {})
+    print(f"\n=== Comparison against {previous_path} ===")
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        old = previous.get(name)
+        if not old or not old.get('median'):
+            print(f"  {name:<{width}}  (no baseline)")
+            continue
+        ratio = result['median'] / old['median']
+        print(f"  {name:<{width}}  {format_seconds(old['median'])} -> {format_seconds(result['median'])}  x{ratio:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="WRB component microbenchmarks")
+    parser.add_argument("--output", help="JSON results file (default: bench_results_<timestamp>.json)")
+    parser.add_argument("--compare", help="previous JSON results file to compare against")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per benchmark")
+    parser.add_argument("--wav-count", type=int, default=4000, help="WAV files in the largest generated library")
+    parser.add_argument("--log-mb", type=int, default=256, help="size of each generated log file in MB")
+    parser.add_argument("--lines", type=int, default=20000, help="receiver lines fed to classify()")
+    parser.add_argument("--library-size", type=int, default=20, help="files in the load_sounds() library case")
+    parser.add_argument("--fade-duration", type=float, default=0.5, help="fade duration in seconds")
+    parser.add_argument("--only", help="comma-separated benchmark groups to run")
+    parser.add_argument("--keep-fixtures", action="store_true", help="keep the generated fixture directory")
+    parser.add_argument("--quick", action="store_true", help="small fixtures for a fast smoke run")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.repeat = min(args.repeat, 3)
+        args.wav_count = min(args.wav_count, 400)
+        args.log_mb = min(args.log_mb, 8)
+        args.lines = min(args.lines, 2000)
+        args.library_size = min(args.library_size, 4)
+    args.durations = (0.5, 5) if args.quick else (0.5, 5, 30)
+
+    print("=== WRB Component Microbenchmarks ===\n")
+    ps = load_piscript()
+    import monitor_system as mon
+    import pygame
+
+    with quiet():
+        audio_ready = ps.init_audio()
+
+    groups = [
+        ("classify", lambda tmp: bench_classify(ps, args)),
+        ("usb_mount_dirs", lambda tmp: bench_usb_mount_dirs(ps, args, tmp)),
+        ("pick_source", lambda tmp: bench_pick_source(ps, args, tmp)),
+        ("load_sounds", lambda tmp: bench_load_sounds(ps, args, tmp)),
+        ("fade", lambda tmp: bench_fade(ps, args, tmp)),
+        ("loudness", lambda tmp: bench_loudness(ps, args, tmp)),
+        ("check_sound_files", lambda tmp: bench_check_sound_files(mon, args, tmp)),
+        ("log_parsing", lambda tmp: bench_log_parsing(mon, args, tmp)),
+    ]
+    if args.only:
+        wanted = set(args.only.split(","))
+        groups = [g for g in groups if g[0] in wanted]
+    if not audio_ready:
+        print("Audio mixer unavailable - skipping load_sounds, fade and loudness benchmarks")
+        groups = [g for g in groups if g[0] not in ("load_sounds", "fade", "loudness")]
+
+    tmp = tempfile.mkdtemp(prefix="wrb_bench_")
+    results = {}
+    try:
+        for name, run in groups:
+            print(f"Running {name}...")
+            group_results = run(tmp)
+            print_results(group_results)
+            results.update(group_results)
+    finally:
+        if args.keep_fixtures:
+            print(f"\nFixtures kept in {tmp}")
+        else:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'pygame': pygame.version.ver,
+            'audio_driver': os.environ.get("SDL_AUDIODRIVER"),
+            'args': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        },
+        'results': results,
+    }
+    output = args.output or f"bench_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        compare_results(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,20 @@ MIX_BUF = 512
 RESCAN_SEC = 1.0
 IDLE_SHUTOFF_SEC = 1.0
 
+# Loudness Normalization
+# Each sound file is analyzed once in the background and its RMS level cached;
+# louder files are played at a lower volume so cues match. Gain only attenuates
+# (pygame volume cannot go above 1.0), so files already quieter than the target
+# are played as-is. A lower target matches more material but makes every cue
+# quieter, so the amp/ALSA volume has to be raised to compensate. -20 dBFS brings
+# typical cue sounds (the default sounds measure -10 to -20) to a common level;
+# use -23 if your sound packs are mastered quieter.
+LOUDNESS_NORMALIZE = True
+LOUDNESS_TARGET_DBFS = -20.0     # Target RMS level
+LOUDNESS_MIN_GAIN = 0.1          # Never attenuate below this volume
+LOUDNESS_CACHE = "/home/pi/WRB/loudness_cache.json"
+LOUDNESS_CACHE_MAX = 2000        # Files remembered in the cache
+
 # File Paths
 LOG_FILE = "/home/pi/WRB/button_log.txt"
 HEALTH_LOG = "/home/pi/WRB/health_log.txt"
@@ -46,7 +46,7 @@ sudo apt upgrade -y
 
 # Step 2: Install required packages
 echo "📦 Installing required packages..."
-sudo apt install -y python3-pip python3-pygame python3-serial python3-gpiozero sox git alsa-utils python3-venv
+sudo apt install -y python3-pip python3-pygame python3-serial python3-gpiozero python3-numpy sox git alsa-utils python3-venv
 
 # Step 3: Create directory structure
 echo "📁 Creating directory structure..."
@@ -153,7 +153,7 @@ echo "🐍 Installing Python dependencies..."
 
 # Install required packages via apt (more reliable than pip)
 echo "📦 Installing Python packages via apt..."
-sudo apt install -y python3-pygame python3-serial python3-gpiozero python3-pip
+sudo apt install -y python3-pygame python3-serial python3-gpiozero python3-numpy python3-pip
 
 # Try to install additional packages via pip if requirements.txt exists
 if [ -f ~/WRB/requirements.txt ]; then
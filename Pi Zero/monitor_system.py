@@ -13,6 +13,9 @@ from datetime import datetime, timedelta
 # Configuration
 LOG_FILE = "/home/pi/WRB/button_log.txt"
 HEALTH_LOG = "/home/pi/WRB/health_log.txt"
+SOUNDS_DIR = "/home/pi/WRB/sounds"
+MEDIA_DIR = "/media"
+LOUDNESS_CACHE = "/home/pi/WRB/loudness_cache.json"
 SERVICE_NAME = "WRB-enhanced.service"
 
 def check_service_status():
@@ -93,8 +96,8 @@ def get_recent_button_presses(hours=1):
 def check_sound_files():
     """Check if sound files are available"""
     sound_dirs = [
-        "/home/pi/WRB/sounds",
-        "/media"
+        SOUNDS_DIR,
+        MEDIA_DIR
     ]
     
     sound_files = {
@@ -109,7 +112,7 @@ def check_sound_files():
             continue
             
         # Check local sounds directory
-        if base_dir == "/home/pi/WRB/sounds":
+        if base_dir == SOUNDS_DIR:
             button1_files = [f for f in os.listdir(base_dir) if f.startswith('button1') and f.endswith('.wav')]
             button2_files = [f for f in os.listdir(base_dir) if f.startswith('button2') and f.endswith('.wav')]
             hold1_files = [f for f in os.listdir(base_dir) if f.startswith('hold1') and f.endswith('.wav')]
@@ -138,6 +141,38 @@ def check_sound_files():
     
     return sound_files
 
+def get_loudness_stats():
+    """Summarize the loudness analysis cache written by the Pi script"""
+    if not os.path.exists(LOUDNESS_CACHE):
+        return None
+    
+    try:
+        with open(LOUDNESS_CACHE, 'r') as f:
+            data = json.load(f)
+        
+        files = data.get('files', {})
+        stats = data.get('stats', {})
+        levels = [entry['rms_dbfs'] for entry in files.values() if entry.get('rms_dbfs') is not None]
+        gains = [entry['gain'] for entry in files.values() if 'gain' in entry]
+        analyzed = stats.get('analyzed', 0)
+        
+        return {
+            'updated': data.get('updated', 'Unknown'),
+            'target_dbfs': data.get('target_dbfs'),
+            'cached_files': len(files),
+            'analyzed': analyzed,
+            'cache_hits': stats.get('cache_hits', 0),
+            'failures': stats.get('failures', 0),
+            'pending': stats.get('pending', 0),
+            'avg_analysis_ms': (stats.get('analysis_sec', 0.0) / analyzed * 1000) if analyzed else 0.0,
+            'rms_range': (min(levels), max(levels)) if levels else None,
+            'gain_range': (min(gains), max(gains)) if gains else None,
+        }
+        
+    except Exception as e:
+        print(f"Error reading loudness cache: {e}")
+        return None
+
 def main():
     """Main monitoring function"""
     print("=== ESP32 Wireless Button System - System Monitor ===\n")
@@ -159,6 +194,20 @@ def main():
     if sound_files['wrong']:
         print(f"  Wrong files: {[os.path.basename(f) for f in sound_files['wrong'][:3]]}")
     
+    # Get loudness analysis statistics
+    loudness = get_loudness_stats()
+    if loudness:
+        print(f"\nLoudness Analysis (updated {loudness['updated']}):")
+        print(f"  Target Level: {loudness['target_dbfs']} dBFS RMS")
+        print(f"  Cached Files: {loudness['cached_files']}")
+        print(f"  Analyzed / Cache Hits / Failures: {loudness['analyzed']} / {loudness['cache_hits']} / {loudness['failures']}")
+        print(f"  Pending: {loudness['pending']}")
+        print(f"  Avg Analysis Time: {loudness['avg_analysis_ms']:.0f} ms")
+        if loudness['rms_range']:
+            print(f"  RMS Range: {loudness['rms_range'][0]:.1f} to {loudness['rms_range'][1]:.1f} dBFS")
+        if loudness['gain_range']:
+            print(f"  Gain Range: {loudness['gain_range'][0]:.2f} to {loudness['gain_range'][1]:.2f}")
+    
     # Get health statistics
     health_stats = parse_health_log()
     if health_stats: